@@ -1,13 +1,24 @@
 """Database configuration using SQLModel."""
+import os
+from sqlalchemy.pool import StaticPool
 from sqlmodel import SQLModel, create_engine, Session
 from app.models.stock_cache import StockCache  # Import to register with metadata
 from app.models.portfolio import Portfolio, PortfolioStock  # Import to register with metadata
 
 # Database URL - using SQLite for now, can be easily swapped for Postgres later
-DATABASE_URL = "sqlite:///arthos.db"
+DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///arthos.db")
 
 # Create engine - separated for easy swapping to Postgres
-engine = create_engine(DATABASE_URL, echo=True)
+if DATABASE_URL in ("sqlite://", "sqlite:///:memory:"):
+    # In-memory SQLite lives in a single connection, so share it across threads
+    engine = create_engine(
+        DATABASE_URL,
+        echo=True,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+else:
+    engine = create_engine(DATABASE_URL, echo=True)
 
 
 def create_db_and_tables():
@@ -169,7 +169,7 @@ async def results(request: Request, tickers: str = Query(..., description="Comma
     Returns:
         HTML page with stock metrics in a DataTable
     """
-    from app.services.stock_service import get_multiple_stock_metrics
+    from app.services.stock_service import get_multiple_stock_metrics, SIGNAL_PRIORITY
     
     if not tickers or not tickers.strip():
         raise HTTPException(status_code=400, detail="At least one ticker symbol is required")
@@ -203,6 +203,9 @@ async def results(request: Request, tickers: str = Query(..., description="Comma
                 metric['sma_50_formatted'] = f"${metric['sma_50']:.2f}"
                 metric['sma_200_formatted'] = f"${metric['sma_200']:.2f}"
                 metric['stddev_50d_formatted'] = f"{metric['devstep']:.1f}"
+            metric['signal_priority'] = SIGNAL_PRIORITY.get(metric.get('signal'), 0)
+        # Render rows in signal order so the markup matches the DataTable's initial sort
+        metrics_list.sort(key=lambda m: m['signal_priority'], reverse=True)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching stock data: {str(e)}")
     
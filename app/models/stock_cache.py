@@ -2,14 +2,13 @@
 from sqlmodel import SQLModel, Field
 from datetime import datetime
 from typing import Optional
-import json
 
 
 class StockCache(SQLModel, table=True):
     """Model for caching stock data from yfinance."""
     
     ticker: str = Field(primary_key=True, description="Stock ticker symbol")
-    data: str = Field(description="JSON string of cached stock data DataFrame")
+    data: bytes = Field(description="Pickled stock data DataFrame")
     cache_timestamp: datetime = Field(default_factory=datetime.now, description="When the cache entry was created")
     
     class Config:
@@ -5,7 +5,7 @@ from app.database import engine
 from datetime import datetime, timedelta
 from typing import Optional, Tuple
 import pandas as pd
-import json
+import pickle
 
 
 CACHE_EXPIRY_HOURS = 1  # 60 minutes
@@ -38,13 +38,11 @@ def get_cached_data(ticker: str) -> Optional[Tuple[pd.DataFrame, datetime]]:
         
         # Deserialize the cached data
         try:
-            data_dict = json.loads(cache_entry.data)
-            # Convert back to DataFrame - transpose because we stored with orient='index'
-            df = pd.DataFrame(data_dict).T
-            df.index = pd.to_datetime(df.index)
+            df = pickle.loads(cache_entry.data)
             return (df, cache_entry.cache_timestamp)
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
-            # If deserialization fails, delete the corrupted cache entry
+        except Exception:
+            # If deserialization fails (corrupt or legacy JSON entry, or a frame pickled
+            # by an incompatible pandas/numpy version), delete the cache entry
             session.delete(cache_entry)
             session.commit()
             return None
@@ -59,11 +57,8 @@ def set_cached_data(ticker: str, data: pd.DataFrame) -> None:
         data: DataFrame with stock data to cache
     """
     with Session(engine) as session:
-        # Convert DataFrame to JSON-serializable format
-        data_dict = data.to_dict(orient='index')
-        # Convert index (datetime) to string for JSON serialization
-        data_dict = {str(k): v for k, v in data_dict.items()}
-        data_json = json.dumps(data_dict)
+        # Pickle keeps the DatetimeIndex, timezone and dtypes intact
+        data_bytes = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
         
         # Check if cache entry already exists
         statement = select(StockCache).where(StockCache.ticker == ticker.upper())
@@ -71,13 +66,13 @@ def set_cached_data(ticker: str, data: pd.DataFrame) -> None:
         
         if cache_entry:
             # Update existing entry
-            cache_entry.data = data_json
+            cache_entry.data = data_bytes
             cache_entry.cache_timestamp = datetime.now()
         else:
             # Create new entry
             cache_entry = StockCache(
                 ticker=ticker.upper(),
-                data=data_json,
+                data=data_bytes,
                 cache_timestamp=datetime.now()
             )
             session.add(cache_entry)
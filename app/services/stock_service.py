@@ -80,6 +80,16 @@ def calculate_devstep(data: pd.DataFrame, sma_50: float) -> float:
     return devstep
 
 
+# Sort priority for each signal on the results page (most oversold first)
+SIGNAL_PRIORITY = {
+    "Extreme Oversold": 5,
+    "Oversold": 4,
+    "Neutral": 3,
+    "Overbought": 2,
+    "Extreme Overbought": 1
+}
+
+
 def calculate_signal(devstep: float) -> str:
     """
     Calculate trading signal based on devstep value.
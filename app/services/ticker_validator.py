@@ -3,6 +3,11 @@ import re
 from typing import List, Tuple
 
 
+# Basic format: 1-5 characters, alphanumeric, may contain dots
+# Examples: AAPL, MSFT, BRK.B, GOOGL
+TICKER_PATTERN = re.compile(r'^[A-Z0-9]{1,5}(\.[A-Z0-9]{1,5})?$')
+
+
 def validate_ticker_format(ticker: str) -> bool:
     """
     Validate ticker format (basic format check).
@@ -18,16 +23,10 @@ def validate_ticker_format(ticker: str) -> bool:
     Returns:
         True if format is valid, False otherwise
     """
-    if not ticker or not ticker.strip():
+    if not ticker:
         return False
     
-    ticker = ticker.strip().upper()
-    
-    # Basic format: 1-5 characters, alphanumeric, may contain dots
-    # Examples: AAPL, MSFT, BRK.B, GOOGL
-    pattern = r'^[A-Z0-9]{1,5}(\.[A-Z0-9]{1,5})?$'
-    
-    return bool(re.match(pattern, ticker))
+    return TICKER_PATTERN.match(ticker.strip().upper()) is not None
 
 
 def validate_ticker_list(tickers: List[str]) -> Tuple[List[str], List[str]]:
@@ -48,7 +47,8 @@ def validate_ticker_list(tickers: List[str]) -> Tuple[List[str], List[str]]:
         if not ticker:
             continue
         
-        if validate_ticker_format(ticker):
+        # Already stripped and uppercased, so match directly
+        if TICKER_PATTERN.match(ticker):
             valid.append(ticker)
         else:
             invalid.append(ticker)
@@ -1,8 +1,7 @@
 #!/usr/bin/env python3
 """Simple script to test sorting in a browser using Playwright.
 Run this while the server is running on localhost:8000"""
-from playwright.sync_api import sync_playwright
-import time
+from playwright.sync_api import sync_playwright, expect
 
 
 def test_sorting():
@@ -18,33 +17,27 @@ def test_sorting():
         # Wait for table to load
         print("Waiting for table to load...")
         page.wait_for_selector('#metricsTable', state='visible')
-        time.sleep(3)  # Give DataTable time to initialize and sort
+        expect(page.locator('#metricsTable tbody tr')).to_have_count(5, timeout=5000)
         
-        # Get all signal values
-        signal_cells = page.locator('#metricsTable tbody tr td:nth-child(6)')
-        count = signal_cells.count()
+        # Get all signal badges (Signal is the 5th column)
+        signals = [
+            text.strip()
+            for text in page.locator('#metricsTable tbody tr td:nth-child(5) .badge').all_inner_texts()
+        ]
         
-        print(f"\nFound {count} rows in table")
-        print("\nSignal order (should be: Extreme Oversold → Oversold → Neutral → Overbought → Extreme Overbought):")
+        print(f"\nFound {len(signals)} rows in table")
+        print("\nSignal order (should be: Extreme OS → Oversold → Neutral → Overbought → Extreme OB):")
         print("-" * 80)
         
-        signals = []
         priority_map = {
-            'Extreme Oversold': 5,
+            'Extreme OS': 5,
             'Oversold': 4,
             'Neutral': 3,
             'Overbought': 2,
-            'Extreme Overbought': 1
+            'Extreme OB': 1
         }
         
-        for i in range(count):
-            cell = signal_cells.nth(i)
-            badge = cell.locator('.badge')
-            if badge.count() > 0:
-                signal_text = badge.inner_text().strip()
-            else:
-                signal_text = cell.inner_text().strip()
-            signals.append(signal_text)
+        for i, signal_text in enumerate(signals):
             priority = priority_map.get(signal_text, 0)
             print(f"Row {i+1:2d}: {signal_text:20s} (priority: {priority})")
         
@@ -67,7 +60,7 @@ def test_sorting():
             print("\n⚠️  Sorting is NOT working correctly!")
         else:
             print("✅ Sorting is working correctly!")
-            print("   Order: Extreme Oversold → Oversold → Neutral → Overbought → Extreme Overbought")
+            print("   Order: Extreme OS → Oversold → Neutral → Overbought → Extreme OB")
         
         print("\nPress Enter to close the browser...")
         input()
@@ -1,11 +1,226 @@
 """Pytest configuration and fixtures."""
+import os
+import threading
+import time
+import httpx
+import numpy as np
+import pandas as pd
 import pytest
+import uvicorn
+
+# Use an in-memory SQLite database (one per xdist worker process); must be set
+# before app.database is imported
+os.environ["DATABASE_URL"] = "sqlite://"
+
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session, delete
 from app.main import app
+from app.database import engine, create_db_and_tables
+from app.models.stock_cache import StockCache
 
 
-@pytest.fixture
+def pytest_addoption(parser):
+    """Register the --network opt-in for tests that call external services."""
+    parser.addoption(
+        "--network",
+        action="store_true",
+        default=False,
+        help="run integration tests that call external services such as yfinance"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip integration tests unless --network was passed."""
+    if config.getoption("--network"):
+        return
+    skip_network = pytest.mark.skip(reason="needs network access; run with --network")
+    for item in items:
+        if "integration" in item.keywords:
+            item.add_marker(skip_network)
+
+
+# pysqlite issues its own BEGIN lazily, which breaks SAVEPOINT handling.
+# Let SQLAlchemy emit BEGIN itself so nested transactions roll back correctly.
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(engine, "begin")
+def _emit_begin(connection):
+    connection.exec_driver_sql("BEGIN")
+
+
+# Tickers the fake yfinance client knows about; anything else returns no data
+FAKE_TICKERS = {"AAPL", "MSFT", "GOOGL", "TSLA", "AMZN"}
+
+
+class FakeTicker:
+    """Stand-in for yfinance.Ticker that serves synthetic price history."""
+
+    def __init__(self, ticker: str):
+        self.ticker = ticker.upper()
+
+    def history(self, start=None, end=None, **kwargs) -> pd.DataFrame:
+        """Return ~2 years of deterministic daily OHLC data for known tickers."""
+        if self.ticker not in FAKE_TICKERS:
+            return pd.DataFrame()
+
+        rng = np.random.default_rng(sum(map(ord, self.ticker)))
+        dates = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=500)
+        close = 100.0 + np.cumsum(rng.normal(0, 1, len(dates)))
+        open_ = close + rng.normal(0, 0.5, len(dates))
+        spread = np.abs(rng.normal(0, 1, len(dates)))
+        return pd.DataFrame({
+            'Open': open_,
+            'High': np.maximum(open_, close) + spread,
+            'Low': np.minimum(open_, close) - spread,
+            'Close': close,
+            'Volume': rng.integers(1_000_000, 5_000_000, len(dates))
+        }, index=dates)
+
+
+@pytest.fixture(scope="session")
+def synthetic_ohlc() -> pd.DataFrame:
+    """100 daily closes rising 100..199, shared read-only; .copy() before mutating."""
+    dates = pd.date_range(start='2024-01-01', periods=100, freq='D')
+    return pd.DataFrame({'Close': np.arange(100.0, 200.0)}, index=dates)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def create_schema():
+    """Create database tables once per test session."""
+    create_db_and_tables()
+
+
+@pytest.fixture(scope="session")
 def client():
-    """Create a test client for the FastAPI app."""
-    return TestClient(app)
+    """Create a test client for the FastAPI app, shared across the session."""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def live_server_url():
+    """Serve the app from a background uvicorn thread for browser tests."""
+    # Port 0 lets the OS pick a free port, so parallel workers don't collide
+    config = uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    
+    deadline = time.monotonic() + 10
+    while not server.started:
+        if not thread.is_alive() or time.monotonic() > deadline:
+            raise RuntimeError("Live server failed to start")
+        time.sleep(0.05)
+    
+    port = server.servers[0].sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}"
+    
+    server.should_exit = True
+    thread.join(timeout=5)
+
 
+@pytest.fixture
+def local_server_url():
+    """Skip unless a dev server (python run.py) is already running on localhost:8000."""
+    url = "http://localhost:8000"
+    try:
+        httpx.get(f"{url}/", timeout=0.5)
+    except httpx.HTTPError:
+        pytest.skip(f"No server running at {url}")
+    return url
+
+
+# Resource types the browser tests never assert on
+BLOCKED_RESOURCE_TYPES = {"stylesheet", "image", "font", "media"}
+
+
+def _block_static_assets(route):
+    """Abort requests for styling assets and let everything else through."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+
+@pytest.fixture
+def browser_page(browser):
+    """Open a page in a fresh, isolated browser context for each test.
+
+    Built on pytest-playwright's session-scoped ``browser``, so one driver and
+    one browser serve the whole run and --browser/--headed/--slowmo apply.
+    """
+    context = browser.new_context()
+    # Tests only need the page's scripts (jQuery, DataTables, Bootstrap JS); skip CDN styling assets
+    context.route("**/*", _block_static_assets)
+    page = context.new_page()
+    yield page
+    context.close()
+
+
+def _clear_stock_cache():
+    """Delete every StockCache row in a single statement."""
+    with Session(engine) as session:
+        session.execute(delete(StockCache))
+        session.commit()
+
+
+@pytest.fixture
+def clear_stock_cache():
+    """Empty the stock cache after each test."""
+    yield
+    _clear_stock_cache()
+
+
+@pytest.fixture
+def fake_yfinance(monkeypatch):
+    """Replace yfinance network calls with synthetic data."""
+    monkeypatch.setattr("app.services.stock_service.yf.Ticker", FakeTicker)
+    yield
+    # Don't leak synthetic data into the cache for later tests
+    _clear_stock_cache()
+
+
+@pytest.fixture(scope="module")
+def fake_yfinance_module():
+    """Module-scoped fake_yfinance, for fixtures that share one fetch across a module."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("app.services.stock_service.yf.Ticker", FakeTicker)
+        yield
+    # Module-scoped fetches cache their data too; don't leak it into later modules
+    _clear_stock_cache()
+
+
+@pytest.fixture
+def db_connection(monkeypatch):
+    """
+    Run a test inside a transaction that is rolled back on teardown.
+    
+    Portfolio service sessions are bound to this connection, so their
+    commits stay inside the outer transaction and no cleanup is needed.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    monkeypatch.setattr("app.services.portfolio_service.engine", connection)
+    yield connection
+    transaction.rollback()
+    connection.close()
+
+
+@pytest.fixture
+def db_session(db_connection):
+    """
+    Session whose commits release a SAVEPOINT inside the test transaction.
+    
+    Objects are not expired on commit, so attributes set before the commit
+    can be read back without another SELECT.
+    """
+    with Session(
+        bind=db_connection,
+        join_transaction_mode="create_savepoint",
+        expire_on_commit=False
+    ) as session:
+        yield session
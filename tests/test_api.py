@@ -3,6 +3,7 @@ import pytest
 from fastapi import status
 
 
+@pytest.mark.usefixtures("fake_yfinance")
 class TestStockAPI:
     """Tests for /v1/stock endpoint."""
     
@@ -1,4 +1,5 @@
 """Tests for cache service module."""
+import pickle
 import pytest
 import pandas as pd
 from datetime import datetime, timedelta
@@ -9,23 +10,15 @@ from app.services.cache_service import (
     CACHE_EXPIRY_HOURS
 )
 from app.models.stock_cache import StockCache
-from app.database import engine, create_db_and_tables
-from sqlmodel import Session
+from app.database import engine
+from sqlalchemy import text
+from sqlmodel import Session, select
 
 
-@pytest.fixture(autouse=True)
-def setup_database():
-    """Create database tables before each test."""
-    create_db_and_tables()
-    yield
-    # Cleanup: delete all cache entries after each test
-    with Session(engine) as session:
-        from sqlmodel import select
-        statement = select(StockCache)
-        all_entries = session.exec(statement).all()
-        for entry in all_entries:
-            session.delete(entry)
-        session.commit()
+pytestmark = pytest.mark.usefixtures("clear_stock_cache")
+
+# Shared 10-day index for the cached frames built in these tests
+DATES = pd.date_range(start='2024-01-01', periods=10, freq='D')
 
 
 class TestGetCachedData:
@@ -39,10 +32,9 @@ class TestGetCachedData:
     def test_get_cached_data_exists_and_valid(self):
         """Test getting cached data when it exists and is valid."""
         # Create test data
-        dates = pd.date_range(start='2024-01-01', periods=10, freq='D')
         test_data = pd.DataFrame({
             'Close': [100.0, 101.0, 102.0, 103.0, 104.0, 105.0, 106.0, 107.0, 108.0, 109.0]
-        }, index=dates)
+        }, index=DATES)
         
         # Set cache
         set_cached_data("AAPL", test_data)
@@ -58,21 +50,17 @@ class TestGetCachedData:
     def test_get_cached_data_expired(self):
         """Test that expired cache entries are deleted."""
         # Create test data
-        dates = pd.date_range(start='2024-01-01', periods=10, freq='D')
         test_data = pd.DataFrame({
             'Close': [100.0] * 10
-        }, index=dates)
+        }, index=DATES)
         
         # Manually create an expired cache entry
         with Session(engine) as session:
-            import json
-            data_dict = test_data.to_dict(orient='index')
-            data_dict = {str(k): v for k, v in data_dict.items()}
-            data_json = json.dumps(data_dict)
+            data_bytes = pickle.dumps(test_data)
             
             expired_entry = StockCache(
                 ticker="AAPL",
-                data=data_json,
+                data=data_bytes,
                 cache_timestamp=datetime.now() - timedelta(hours=CACHE_EXPIRY_HOURS + 1)
             )
             session.add(expired_entry)
@@ -84,15 +72,35 @@ class TestGetCachedData:
         
         # Verify entry was deleted
         with Session(engine) as session:
-            from sqlmodel import select
+            statement = select(StockCache).where(StockCache.ticker == "AAPL")
+            entry = session.exec(statement).first()
+            assert entry is None
+    
+    @pytest.mark.parametrize("stored", [
+        '{"2024-01-01 00:00:00": {"Close": 100.0}}',  # Legacy JSON-encoded entry
+        b"cno_such_module\nFrame\n.",  # Pickle referencing a module that no longer exists
+    ])
+    def test_get_cached_data_unreadable_entry(self, stored):
+        """Test that entries that can't be unpickled are deleted and treated as a miss."""
+        # Insert with raw SQL, as a row written by an older version would be
+        with engine.begin() as connection:
+            connection.execute(
+                text("INSERT INTO stockcache (ticker, data, cache_timestamp) VALUES (:ticker, :data, :ts)"),
+                {"ticker": "AAPL", "data": stored, "ts": datetime.now()}
+            )
+        
+        result = get_cached_data("AAPL")
+        assert result is None
+        
+        # Verify entry was deleted
+        with Session(engine) as session:
             statement = select(StockCache).where(StockCache.ticker == "AAPL")
             entry = session.exec(statement).first()
             assert entry is None
     
     def test_get_cached_data_case_insensitive(self):
         """Test that cache lookup is case-insensitive."""
-        dates = pd.date_range(start='2024-01-01', periods=10, freq='D')
-        test_data = pd.DataFrame({'Close': [100.0] * 10}, index=dates)
+        test_data = pd.DataFrame({'Close': [100.0] * 10}, index=DATES)
         
         set_cached_data("AAPL", test_data)
         
@@ -106,14 +114,12 @@ class TestSetCachedData:
     
     def test_set_cached_data_new_entry(self):
         """Test setting cache for a new ticker."""
-        dates = pd.date_range(start='2024-01-01', periods=10, freq='D')
-        test_data = pd.DataFrame({'Close': [100.0] * 10}, index=dates)
+        test_data = pd.DataFrame({'Close': [100.0] * 10}, index=DATES)
         
         set_cached_data("AAPL", test_data)
         
         # Verify entry was created
         with Session(engine) as session:
-            from sqlmodel import select
             statement = select(StockCache).where(StockCache.ticker == "AAPL")
             entry = session.exec(statement).first()
             assert entry is not None
@@ -121,9 +127,8 @@ class TestSetCachedData:
     
     def test_set_cached_data_update_existing(self):
         """Test updating existing cache entry."""
-        dates = pd.date_range(start='2024-01-01', periods=10, freq='D')
-        test_data1 = pd.DataFrame({'Close': [100.0] * 10}, index=dates)
-        test_data2 = pd.DataFrame({'Close': [200.0] * 10}, index=dates)
+        test_data1 = pd.DataFrame({'Close': [100.0] * 10}, index=DATES)
+        test_data2 = pd.DataFrame({'Close': [200.0] * 10}, index=DATES)
         
         # Set initial cache
         set_cached_data("AAPL", test_data1)
@@ -133,7 +138,6 @@ class TestSetCachedData:
         
         # Verify only one entry exists and it's updated
         with Session(engine) as session:
-            from sqlmodel import select
             statement = select(StockCache).where(StockCache.ticker == "AAPL")
             entries = session.exec(statement).all()
             assert len(entries) == 1
@@ -142,14 +146,12 @@ class TestSetCachedData:
     
     def test_set_cached_data_case_insensitive(self):
         """Test that cache stores ticker in uppercase."""
-        dates = pd.date_range(start='2024-01-01', periods=10, freq='D')
-        test_data = pd.DataFrame({'Close': [100.0] * 10}, index=dates)
+        test_data = pd.DataFrame({'Close': [100.0] * 10}, index=DATES)
         
         set_cached_data("aapl", test_data)
         
         # Verify ticker is stored in uppercase
         with Session(engine) as session:
-            from sqlmodel import select
             statement = select(StockCache).where(StockCache.ticker == "AAPL")
             entry = session.exec(statement).first()
             assert entry is not None
@@ -161,8 +163,7 @@ class TestPurgeExpiredCache:
     
     def test_purge_expired_cache_no_expired(self):
         """Test purging when no expired entries exist."""
-        dates = pd.date_range(start='2024-01-01', periods=10, freq='D')
-        test_data = pd.DataFrame({'Close': [100.0] * 10}, index=dates)
+        test_data = pd.DataFrame({'Close': [100.0] * 10}, index=DATES)
         
         # Create a fresh cache entry
         set_cached_data("AAPL", test_data)
@@ -177,27 +178,23 @@ class TestPurgeExpiredCache:
     
     def test_purge_expired_cache_with_expired(self):
         """Test purging expired cache entries."""
-        dates = pd.date_range(start='2024-01-01', periods=10, freq='D')
-        test_data = pd.DataFrame({'Close': [100.0] * 10}, index=dates)
+        test_data = pd.DataFrame({'Close': [100.0] * 10}, index=DATES)
         
         # Create fresh entry
         set_cached_data("AAPL", test_data)
         
         # Manually create expired entries
         with Session(engine) as session:
-            import json
-            data_dict = test_data.to_dict(orient='index')
-            data_dict = {str(k): v for k, v in data_dict.items()}
-            data_json = json.dumps(data_dict)
+            data_bytes = pickle.dumps(test_data)
             
             expired1 = StockCache(
                 ticker="MSFT",
-                data=data_json,
+                data=data_bytes,
                 cache_timestamp=datetime.now() - timedelta(hours=CACHE_EXPIRY_HOURS + 1)
             )
             expired2 = StockCache(
                 ticker="GOOGL",
-                data=data_json,
+                data=data_bytes,
                 cache_timestamp=datetime.now() - timedelta(hours=CACHE_EXPIRY_HOURS + 2)
             )
             session.add(expired1)
@@ -210,7 +207,6 @@ class TestPurgeExpiredCache:
         
         # Verify expired entries are gone
         with Session(engine) as session:
-            from sqlmodel import select
             statement = select(StockCache).where(StockCache.ticker.in_(["MSFT", "GOOGL"]))
             entries = session.exec(statement).all()
             assert len(entries) == 0
@@ -0,0 +1,43 @@
+"""Smoke tests against the real yfinance API (run with --network)."""
+import pytest
+import pandas as pd
+from fastapi import status
+from app.services.stock_service import fetch_stock_data, get_multiple_stock_metrics
+
+
+pytestmark = [pytest.mark.integration, pytest.mark.usefixtures("clear_stock_cache")]
+
+
+class TestLiveYfinance:
+    """End-to-end checks that the service and endpoints work with live market data."""
+    
+    def test_fetch_stock_data_live(self):
+        """Test fetching live data for a valid ticker."""
+        data = fetch_stock_data("AAPL")
+        
+        assert isinstance(data, pd.DataFrame)
+        assert not data.empty
+        assert 'Close' in data.columns
+    
+    def test_get_multiple_stock_metrics_live(self):
+        """Test fetching metrics for real and invalid tickers over the network."""
+        results = get_multiple_stock_metrics(["AAPL", "INVALIDTICKER12345"])
+        
+        assert len(results) == 2
+        assert results[0]["ticker"] == "AAPL"
+        assert "error" not in results[0]
+        assert "error" in results[1]
+    
+    def test_stock_api_live(self, client):
+        """Test /v1/stock with a real ticker."""
+        response = client.get("/v1/stock?q=AAPL")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["ticker"] == "AAPL"
+    
+    def test_stock_detail_page_live(self, client):
+        """Test loading a stock detail page with live data."""
+        response = client.get("/stock/AAPL")
+        
+        assert response.status_code == status.HTTP_200_OK
+        assert "AAPL" in response.text
@@ -3,19 +3,16 @@ import pytest
 from fastapi import status
 from uuid import UUID
 from app.services.portfolio_service import create_portfolio, add_stocks_to_portfolio
-from app.database import engine, create_db_and_tables
-from sqlmodel import Session
+from app.database import engine
+from sqlmodel import Session, select
 from app.models.portfolio import Portfolio, PortfolioStock
 
 
 @pytest.fixture(autouse=True)
 def setup_database():
-    """Create database tables and clean up before and after each test."""
-    create_db_and_tables()
-    
+    """Clean up portfolio data before and after each test."""
     # Cleanup before test: delete all entries
     with Session(engine) as session:
-        from sqlmodel import select
         statement = select(PortfolioStock)
         all_stocks = session.exec(statement).all()
         for stock in all_stocks:
@@ -32,7 +29,6 @@ def setup_database():
     
     # Cleanup after test: delete all entries
     with Session(engine) as session:
-        from sqlmodel import select
         statement = select(PortfolioStock)
         all_stocks = session.exec(statement).all()
         for stock in all_stocks:
@@ -13,61 +13,44 @@ from app.services.portfolio_service import (
     remove_stock_from_portfolio,
     get_portfolio_stocks
 )
-from app.database import engine, create_db_and_tables
-from sqlmodel import Session
 from app.models.portfolio import Portfolio, PortfolioStock
+from sqlmodel import Session
 
 
-@pytest.fixture(autouse=True)
-def setup_database():
-    """Create database tables before each test."""
-    create_db_and_tables()
-    yield
-    # Cleanup
-    with Session(engine) as session:
-        from sqlmodel import select
-        statement = select(PortfolioStock)
-        all_stocks = session.exec(statement).all()
-        for stock in all_stocks:
-            session.delete(stock)
-        
-        statement = select(Portfolio)
-        all_portfolios = session.exec(statement).all()
-        for portfolio in all_portfolios:
-            session.delete(portfolio)
-        
+def _make_portfolio_with_stocks(bind, name, tickers):
+    """Insert a portfolio and its stocks in one commit, skipping service validation."""
+    now = datetime.now()
+    with Session(bind, expire_on_commit=False) as session:
+        portfolio = Portfolio(portfolio_name=name, date_added=now, date_modified=now)
+        session.add(portfolio)
+        session.add_all([
+            PortfolioStock(portfolio_id=portfolio.portfolio_id, ticker=ticker, date_added=now)
+            for ticker in tickers
+        ])
         session.commit()
+        return portfolio
 
 
 class TestValidatePortfolioName:
     """Tests for validate_portfolio_name function."""
     
-    def test_valid_name_alphanumeric(self):
-        """Test valid alphanumeric name."""
-        assert validate_portfolio_name("MyPortfolio123") is True
-    
-    def test_valid_name_with_spaces(self):
-        """Test valid name with spaces."""
-        assert validate_portfolio_name("My Portfolio 123") is True
-    
-    def test_invalid_empty_string(self):
-        """Test empty string."""
-        assert validate_portfolio_name("") is False
-        assert validate_portfolio_name("   ") is False
-    
-    def test_invalid_too_long(self):
-        """Test name that's too long."""
-        long_name = "A" * 129  # 129 characters
-        assert validate_portfolio_name(long_name) is False
-    
-    def test_invalid_special_characters(self):
-        """Test name with special characters."""
-        assert validate_portfolio_name("My-Portfolio") is False
-        assert validate_portfolio_name("My_Portfolio") is False
-        assert validate_portfolio_name("My@Portfolio") is False
-        assert validate_portfolio_name("My.Portfolio") is False
-
-
+    @pytest.mark.parametrize("name,expected", [
+        ("MyPortfolio123", True),
+        ("My Portfolio 123", True),
+        ("", False),
+        ("   ", False),
+        ("A" * 129, False),
+        ("My-Portfolio", False),
+        ("My_Portfolio", False),
+        ("My@Portfolio", False),
+        ("My.Portfolio", False),
+    ])
+    def test_validate_portfolio_name(self, name, expected):
+        """Test valid and invalid portfolio names."""
+        assert validate_portfolio_name(name) is expected
+
+
+@pytest.mark.usefixtures("db_connection")
 class TestCreatePortfolio:
     """Tests for create_portfolio function."""
     
@@ -91,6 +74,7 @@ class TestCreatePortfolio:
         assert portfolio.portfolio_name == "Test Portfolio"
 
 
+@pytest.mark.usefixtures("db_connection")
 class TestGetAllPortfolios:
     """Tests for get_all_portfolios function."""
     
@@ -110,6 +94,7 @@ class TestGetAllPortfolios:
         assert any(p.portfolio_id == portfolio2.portfolio_id for p in portfolios)
 
 
+@pytest.mark.usefixtures("db_connection")
 class TestGetPortfolio:
     """Tests for get_portfolio function."""
     
@@ -128,6 +113,7 @@ class TestGetPortfolio:
             get_portfolio(fake_id)
 
 
+@pytest.mark.usefixtures("db_connection")
 class TestUpdatePortfolioName:
     """Tests for update_portfolio_name function."""
     
@@ -147,6 +133,7 @@ class TestUpdatePortfolioName:
             update_portfolio_name(portfolio.portfolio_id, "Invalid-Name!")
 
 
+@pytest.mark.usefixtures("db_connection")
 class TestDeletePortfolio:
     """Tests for delete_portfolio function."""
     
@@ -162,6 +149,7 @@ class TestDeletePortfolio:
             get_portfolio(portfolio.portfolio_id)
 
 
+@pytest.mark.usefixtures("db_connection")
 class TestAddStocksToPortfolio:
     """Tests for add_stocks_to_portfolio function."""
     
@@ -193,13 +181,13 @@ class TestAddStocksToPortfolio:
             add_stocks_to_portfolio(portfolio.portfolio_id, ["INVALID12345"])
 
 
+@pytest.mark.usefixtures("db_connection")
 class TestRemoveStockFromPortfolio:
     """Tests for remove_stock_from_portfolio function."""
     
-    def test_remove_stock_success(self):
+    def test_remove_stock_success(self, db_connection):
         """Test successfully removing a stock."""
-        portfolio = create_portfolio("Test Portfolio")
-        add_stocks_to_portfolio(portfolio.portfolio_id, ["AAPL", "MSFT"])
+        portfolio = _make_portfolio_with_stocks(db_connection, "Test Portfolio", ["AAPL", "MSFT"])
         
         result = remove_stock_from_portfolio(portfolio.portfolio_id, "AAPL")
         assert result is True
@@ -1,9 +1,11 @@
 """Tests for results page functionality."""
 import pytest
+from bs4 import BeautifulSoup
 from fastapi import status
 from app.services.stock_service import get_multiple_stock_metrics
 
 
+@pytest.mark.usefixtures("fake_yfinance")
 class TestMultipleStockMetrics:
     """Tests for get_multiple_stock_metrics function."""
     
@@ -55,6 +57,7 @@ class TestMultipleStockMetrics:
         assert all(r["ticker"] in ["AAPL", "MSFT"] for r in results if "error" not in r)
 
 
+@pytest.mark.usefixtures("fake_yfinance")
 class TestResultsPageAPI:
     """Tests for /results endpoint."""
     
@@ -75,6 +78,28 @@ class TestResultsPageAPI:
         assert "AAPL" in response.text
         assert "MSFT" in response.text
     
+    def test_results_page_signal_sorting(self, client):
+        """Test results page renders rows sorted by Signal priority."""
+        response = client.get("/results?tickers=AAPL,MSFT,GOOGL,TSLA,AMZN")
+        
+        assert response.status_code == status.HTTP_200_OK
+        
+        # Badge text as rendered in the Signal column (5th)
+        priority_map = {
+            "Extreme OS": 5,
+            "Oversold": 4,
+            "Neutral": 3,
+            "Overbought": 2,
+            "Extreme OB": 1
+        }
+        soup = BeautifulSoup(response.text, "html.parser")
+        signals = [badge.get_text(strip=True)
+                   for badge in soup.select("#metricsTable tbody tr td:nth-of-type(5) .badge")]
+        priorities = [priority_map.get(signal, 0) for signal in signals]
+        
+        assert len(signals) == 5
+        assert priorities == sorted(priorities, reverse=True)
+    
     def test_results_page_missing_tickers(self, client):
         """Test results page without tickers parameter."""
         response = client.get("/results")
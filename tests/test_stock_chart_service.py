@@ -1,24 +1,40 @@
 """Tests for stock chart service."""
+import numpy as np
 import pytest
 from app.services.stock_chart_service import get_stock_chart_data
-from app.database import engine, create_db_and_tables
-from sqlmodel import Session
 
 
-@pytest.fixture(autouse=True)
-def setup_database():
-    """Create database tables before each test."""
-    create_db_and_tables()
-    yield
-    # Cleanup is handled by cache service
+@pytest.fixture(scope="module")
+def aapl_chart(fake_yfinance_module):
+    """Chart data for AAPL, fetched once per module."""
+    return get_stock_chart_data("AAPL")
 
 
+@pytest.fixture(scope="module")
+def msft_chart(fake_yfinance_module):
+    """Chart data for MSFT, fetched once per module."""
+    return get_stock_chart_data("MSFT")
+
+
+@pytest.fixture(scope="module")
+def googl_chart(fake_yfinance_module):
+    """Chart data for GOOGL, fetched once per module."""
+    return get_stock_chart_data("GOOGL")
+
+
+@pytest.fixture(scope="module")
+def tsla_chart(fake_yfinance_module):
+    """Chart data for TSLA, fetched once per module."""
+    return get_stock_chart_data("TSLA")
+
+
+@pytest.mark.usefixtures("fake_yfinance_module")
 class TestStockChartService:
     """Tests for stock chart service."""
     
-    def test_get_stock_chart_data_success(self):
+    def test_get_stock_chart_data_success(self, aapl_chart):
         """Test successfully getting chart data for a valid ticker."""
-        chart_data = get_stock_chart_data("AAPL")
+        chart_data = aapl_chart
         
         assert chart_data["ticker"] == "AAPL"
         assert "dates" in chart_data
@@ -69,30 +85,31 @@ class TestStockChartService:
         with pytest.raises(ValueError):
             get_stock_chart_data("INVALIDTICKER12345")
     
-    def test_get_stock_chart_data_candlestick_structure(self):
+    def test_get_stock_chart_data_candlestick_structure(self, msft_chart):
         """Test that candlestick data has correct structure."""
-        chart_data = get_stock_chart_data("MSFT")
-        
-        # Check all candles have required fields
-        for candle in chart_data["candlestick_data"]:
-            assert "x" in candle
-            assert "open" in candle
-            assert "high" in candle
-            assert "low" in candle
-            assert "close" in candle
-            
-            # Check that high >= low
-            assert candle["high"] >= candle["low"]
-            # Check that high >= open and close
-            assert candle["high"] >= candle["open"]
-            assert candle["high"] >= candle["close"]
-            # Check that low <= open and close
-            assert candle["low"] <= candle["open"]
-            assert candle["low"] <= candle["close"]
+        chart_data = msft_chart
+        
+        candles = chart_data["candlestick_data"]
+        assert {"x", "open", "high", "low", "close"}.issubset(candles[0].keys())
+        
+        # Extract OHLC columns once (raises KeyError if any candle lacks a field)
+        opens = np.fromiter((c["open"] for c in candles), dtype=np.float64, count=len(candles))
+        highs = np.fromiter((c["high"] for c in candles), dtype=np.float64, count=len(candles))
+        lows = np.fromiter((c["low"] for c in candles), dtype=np.float64, count=len(candles))
+        closes = np.fromiter((c["close"] for c in candles), dtype=np.float64, count=len(candles))
+        
+        # Check that high >= low
+        assert np.all(highs >= lows)
+        # Check that high >= open and close
+        assert np.all(highs >= opens)
+        assert np.all(highs >= closes)
+        # Check that low <= open and close
+        assert np.all(lows <= opens)
+        assert np.all(lows <= closes)
     
-    def test_get_stock_chart_data_sma_structure(self):
+    def test_get_stock_chart_data_sma_structure(self, googl_chart):
         """Test that SMA data has correct structure."""
-        chart_data = get_stock_chart_data("GOOGL")
+        chart_data = googl_chart
         
         # Check SMA 50 structure
         for sma_point in chart_data["sma_50"]:
@@ -108,9 +125,9 @@ class TestStockChartService:
             # y can be None for early days, or a number
             assert sma_point["y"] is None or isinstance(sma_point["y"], (int, float))
     
-    def test_get_stock_chart_data_std_bands_structure(self):
+    def test_get_stock_chart_data_std_bands_structure(self, msft_chart):
         """Test that STD dev bands have correct structure."""
-        chart_data = get_stock_chart_data("MSFT")
+        chart_data = msft_chart
         
         std_bands = chart_data["std_bands"]
         
@@ -126,34 +143,22 @@ class TestStockChartService:
             # y can be None or a number
             assert band_point["y"] is None or isinstance(band_point["y"], (int, float))
     
-    def test_get_stock_chart_data_dates_match(self):
+    def test_get_stock_chart_data_dates_match(self, tsla_chart):
         """Test that dates match across all data arrays."""
-        chart_data = get_stock_chart_data("TSLA")
+        chart_data = tsla_chart
         
         dates = chart_data["dates"]
-        candlestick_dates = [c["x"] for c in chart_data["candlestick_data"]]
-        sma50_dates = [s["x"] for s in chart_data["sma_50"]]
-        sma200_dates = [s["x"] for s in chart_data["sma_200"]]
-        std1_upper_dates = [s["x"] for s in chart_data["std_bands"]["std_1_upper"]]
-        std1_lower_dates = [s["x"] for s in chart_data["std_bands"]["std_1_lower"]]
-        std2_upper_dates = [s["x"] for s in chart_data["std_bands"]["std_2_upper"]]
-        std2_lower_dates = [s["x"] for s in chart_data["std_bands"]["std_2_lower"]]
-        
-        # All should have the same length
-        assert len(dates) == len(candlestick_dates)
-        assert len(dates) == len(sma50_dates)
-        assert len(dates) == len(sma200_dates)
-        assert len(dates) == len(std1_upper_dates)
-        assert len(dates) == len(std1_lower_dates)
-        assert len(dates) == len(std2_upper_dates)
-        assert len(dates) == len(std2_lower_dates)
-        
-        # All should have matching dates
-        assert dates == candlestick_dates
-        assert dates == sma50_dates
-        assert dates == sma200_dates
-        assert dates == std1_upper_dates
-        assert dates == std1_lower_dates
-        assert dates == std2_upper_dates
-        assert dates == std2_lower_dates
-
+        series = {
+            "candlestick_data": chart_data["candlestick_data"],
+            "sma_50": chart_data["sma_50"],
+            "sma_200": chart_data["sma_200"],
+            "std_1_upper": chart_data["std_bands"]["std_1_upper"],
+            "std_1_lower": chart_data["std_bands"]["std_1_lower"],
+            "std_2_upper": chart_data["std_bands"]["std_2_upper"],
+            "std_2_lower": chart_data["std_bands"]["std_2_lower"],
+        }
+        
+        for name, points in series.items():
+            # All should have the same length and matching dates
+            assert len(points) == len(dates), f"{name} length mismatch"
+            assert all(point["x"] == date for point, date in zip(points, dates)), f"{name} dates mismatch"
@@ -3,12 +3,19 @@ import pytest
 from fastapi import status
 
 
+@pytest.fixture(scope="module")
+def aapl_detail_response(client, fake_yfinance_module):
+    """Render the AAPL detail page once and share the response across tests."""
+    return client.get("/stock/AAPL")
+
+
+@pytest.mark.usefixtures("fake_yfinance")
 class TestStockDetailAPI:
     """Tests for /stock/{ticker} endpoint."""
     
-    def test_stock_detail_page_success(self, client):
+    def test_stock_detail_page_success(self, aapl_detail_response):
         """Test successfully loading stock detail page."""
-        response = client.get("/stock/AAPL")
+        response = aapl_detail_response
         
         assert response.status_code == status.HTTP_200_OK
         assert "text/html" in response.headers["content-type"]
@@ -21,17 +28,17 @@ class TestStockDetailAPI:
         
         assert response.status_code == status.HTTP_404_NOT_FOUND
     
-    def test_stock_detail_page_contains_chart(self, client):
+    def test_stock_detail_page_contains_chart(self, aapl_detail_response):
         """Test that stock detail page contains chart container."""
-        response = client.get("/stock/MSFT")
+        response = aapl_detail_response
         
         assert response.status_code == status.HTTP_200_OK
         assert "stockChart" in response.text
         assert "plotly" in response.text.lower() or "Plotly" in response.text
     
-    def test_stock_detail_page_contains_metrics(self, client):
+    def test_stock_detail_page_contains_metrics(self, aapl_detail_response):
         """Test that stock detail page contains metrics."""
-        response = client.get("/stock/GOOGL")
+        response = aapl_detail_response
         
         assert response.status_code == status.HTTP_200_OK
         assert "Current Metrics" in response.text
@@ -41,9 +48,6 @@ class TestStockDetailAPI:
     
     def test_stock_detail_page_ticker_case_insensitive(self, client):
         """Test that ticker is case-insensitive."""
-        response1 = client.get("/stock/aapl")
-        response2 = client.get("/stock/AAPL")
+        response = client.get("/stock/aapl")
         
-        assert response1.status_code == status.HTTP_200_OK
-        assert response2.status_code == status.HTTP_200_OK
-
+        assert response.status_code == status.HTTP_200_OK
@@ -1,7 +1,9 @@
 """Tests for stock service module."""
 import pytest
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
+from unittest.mock import patch
 from app.services.stock_service import (
     fetch_stock_data,
     calculate_sma,
@@ -14,23 +16,16 @@ from app.services.stock_service import (
 class TestCalculateSMA:
     """Tests for calculate_sma function."""
     
-    def test_sma_with_sufficient_data(self):
+    def test_sma_with_sufficient_data(self, synthetic_ohlc):
         """Test SMA calculation with sufficient data points."""
-        # Create sample data with 100 days
-        dates = pd.date_range(start='2024-01-01', periods=100, freq='D')
-        prices = pd.Series(range(100, 200), index=dates)
-        data = pd.DataFrame({'Close': prices})
-        
-        sma_50 = calculate_sma(data, 50)
+        sma_50 = calculate_sma(synthetic_ohlc, 50)
         # SMA of last 50 values: (150+151+...+199)/50 = 174.5
         expected = sum(range(150, 200)) / 50
         assert sma_50 == pytest.approx(expected, rel=1e-2)
     
-    def test_sma_with_insufficient_data(self):
+    def test_sma_with_insufficient_data(self, synthetic_ohlc):
         """Test SMA calculation when data points are less than window."""
-        dates = pd.date_range(start='2024-01-01', periods=30, freq='D')
-        prices = pd.Series(range(100, 130), index=dates)
-        data = pd.DataFrame({'Close': prices})
+        data = synthetic_ohlc.iloc[:30]
         
         sma_50 = calculate_sma(data, 50)
         # Should use all available data (30 points)
@@ -41,12 +36,9 @@ class TestCalculateSMA:
 class TestCalculateDevstep:
     """Tests for calculate_devstep function."""
     
-    def test_devstep_calculation(self):
+    def test_devstep_calculation(self, synthetic_ohlc):
         """Test devstep calculation."""
-        # Create sample data
-        dates = pd.date_range(start='2024-01-01', periods=100, freq='D')
-        prices = pd.Series([100.0] * 100, index=dates)  # Constant price
-        data = pd.DataFrame({'Close': prices})
+        data = synthetic_ohlc.assign(Close=100.0)  # Constant price
         
         sma_50 = 100.0
         devstep = calculate_devstep(data, sma_50)
@@ -56,13 +48,11 @@ class TestCalculateDevstep:
     
     def test_devstep_with_variation(self):
         """Test devstep with price variation."""
-        import numpy as np
         dates = pd.date_range(start='2024-01-01', periods=100, freq='D')
         # Create prices with variation - gradually increasing with some noise
-        np.random.seed(42)  # For reproducibility
-        base_prices = [100.0 + i * 0.1 + np.random.normal(0, 1) for i in range(100)]
-        prices = pd.Series(base_prices, index=dates)
-        data = pd.DataFrame({'Close': prices})
+        rng = np.random.default_rng(42)  # For reproducibility
+        base_prices = 100.0 + 0.1 * np.arange(100) + rng.normal(0, 1, 100)
+        data = pd.DataFrame({'Close': base_prices}, index=dates)
         
         sma_50 = data['Close'].tail(50).mean()
         devstep = calculate_devstep(data, sma_50)
@@ -75,41 +65,32 @@ class TestCalculateDevstep:
 class TestCalculateSignal:
     """Tests for calculate_signal function."""
     
-    def test_signal_neutral(self):
-        """Test signal calculation for neutral range."""
-        assert calculate_signal(0.0) == "Neutral"
-        assert calculate_signal(0.5) == "Neutral"
-        assert calculate_signal(-0.5) == "Neutral"
-        assert calculate_signal(1.0) == "Neutral"
-        assert calculate_signal(-1.0) == "Neutral"
-    
-    def test_signal_overbought(self):
-        """Test signal calculation for overbought range."""
-        assert calculate_signal(1.5) == "Overbought"
-        assert calculate_signal(2.0) == "Overbought"
-    
-    def test_signal_extreme_overbought(self):
-        """Test signal calculation for extreme overbought."""
-        assert calculate_signal(2.1) == "Extreme Overbought"
-        assert calculate_signal(3.0) == "Extreme Overbought"
-    
-    def test_signal_oversold(self):
-        """Test signal calculation for oversold range."""
-        assert calculate_signal(-1.5) == "Oversold"
-        assert calculate_signal(-2.0) == "Oversold"
-    
-    def test_signal_extreme_oversold(self):
-        """Test signal calculation for extreme oversold."""
-        assert calculate_signal(-2.1) == "Extreme Oversold"
-        assert calculate_signal(-3.0) == "Extreme Oversold"
+    @pytest.mark.parametrize("devstep,expected", [
+        (0.0, "Neutral"),
+        (0.5, "Neutral"),
+        (-0.5, "Neutral"),
+        (1.0, "Neutral"),
+        (-1.0, "Neutral"),
+        (1.5, "Overbought"),
+        (2.0, "Overbought"),
+        (2.1, "Extreme Overbought"),
+        (3.0, "Extreme Overbought"),
+        (-1.5, "Oversold"),
+        (-2.0, "Oversold"),
+        (-2.1, "Extreme Oversold"),
+        (-3.0, "Extreme Oversold"),
+    ])
+    def test_signal(self, devstep, expected):
+        """Test signal calculation across all threshold ranges."""
+        assert calculate_signal(devstep) == expected
 
 
+@pytest.mark.usefixtures("fake_yfinance")
 class TestFetchStockData:
     """Tests for fetch_stock_data function."""
     
     def test_fetch_valid_ticker(self):
         """Test fetching data for a valid ticker."""
-        # Use a well-known ticker like AAPL
         data = fetch_stock_data("AAPL")
         
         assert isinstance(data, pd.DataFrame)
@@ -122,6 +103,7 @@ class TestFetchStockData:
             fetch_stock_data("INVALIDTICKER12345")
 
 
+@pytest.mark.usefixtures("fake_yfinance")
 class TestGetStockMetrics:
     """Tests for get_stock_metrics function."""
     
@@ -161,118 +143,37 @@ class TestGetStockMetrics:
         assert metrics["ticker"] == "AAPL"
 
 
+@pytest.fixture(scope="module")
+def tsla_data(fake_yfinance_module):
+    """Fetch the (fake) TSLA frame once for every TestTSLADebug case."""
+    return fetch_stock_data("TSLA")
+
+
 class TestTSLADebug:
-    """Debug test for TSLA to validate SMA calculations."""
+    """Validate TSLA SMA and devstep calculations against manual pandas results."""
     
-    def test_tsla_debug_sma_calculations(self, capsys):
-        """Fetch TSLA data and print intermediate outputs to validate SMA calculations."""
-        ticker = "TSLA"
-        
-        print(f"\n{'='*80}")
-        print(f"DEBUG TEST: Fetching and validating SMA calculations for {ticker}")
-        print(f"{'='*80}\n")
-        
-        # Fetch stock data
-        print("Step 1: Fetching stock data from yfinance...")
-        data = fetch_stock_data(ticker)
-        print(f"✓ Data fetched successfully")
-        print(f"  - Total data points: {len(data)}")
-        print(f"  - Date range: {data.index.min()} to {data.index.max()}")
-        print(f"  - Columns: {list(data.columns)}")
-        
-        # Display first and last few rows
-        print(f"\n  First 5 rows:")
-        print(data.head().to_string())
-        print(f"\n  Last 5 rows:")
-        print(data.tail().to_string())
-        
-        # Calculate SMAs
-        print(f"\nStep 2: Calculating 50-day SMA...")
-        sma_50 = calculate_sma(data, 50)
-        print(f"✓ 50-day SMA calculated: ${sma_50:.2f}")
-        
-        # Manual calculation for validation
-        last_50_prices = data['Close'].tail(50)
-        manual_sma_50 = last_50_prices.mean()
-        print(f"  - Last 50 closing prices count: {len(last_50_prices)}")
-        print(f"  - Manual calculation: ${manual_sma_50:.2f}")
-        print(f"  - Validation: {'✓ PASS' if abs(sma_50 - manual_sma_50) < 0.01 else '✗ FAIL'}")
-        print(f"  - Last 50 prices range: ${last_50_prices.min():.2f} to ${last_50_prices.max():.2f}")
-        print(f"  - Last 50 prices mean: ${manual_sma_50:.2f}")
-        print(f"  - Last 50 prices std dev: ${last_50_prices.std():.2f}")
-        
-        print(f"\nStep 3: Calculating 200-day SMA...")
-        sma_200 = calculate_sma(data, 200)
-        print(f"✓ 200-day SMA calculated: ${sma_200:.2f}")
-        
-        # Manual calculation for validation
-        if len(data) >= 200:
-            last_200_prices = data['Close'].tail(200)
-            manual_sma_200 = last_200_prices.mean()
-            print(f"  - Last 200 closing prices count: {len(last_200_prices)}")
-            print(f"  - Manual calculation: ${manual_sma_200:.2f}")
-            print(f"  - Validation: {'✓ PASS' if abs(sma_200 - manual_sma_200) < 0.01 else '✗ FAIL'}")
-            print(f"  - Last 200 prices range: ${last_200_prices.min():.2f} to ${last_200_prices.max():.2f}")
-            print(f"  - Last 200 prices mean: ${manual_sma_200:.2f}")
-            print(f"  - Last 200 prices std dev: ${last_200_prices.std():.2f}")
-        else:
-            print(f"  - Warning: Only {len(data)} data points available, using all data")
-            manual_sma_200 = data['Close'].mean()
-            print(f"  - Using all {len(data)} data points")
-            print(f"  - Manual calculation: ${manual_sma_200:.2f}")
-            print(f"  - Validation: {'✓ PASS' if abs(sma_200 - manual_sma_200) < 0.01 else '✗ FAIL'}")
-        
-        # Calculate devstep
-        print(f"\nStep 4: Calculating devstep...")
-        devstep = calculate_devstep(data, sma_50)
-        print(f"✓ Devstep calculated: {devstep:.4f}")
-        
-        # Manual calculation for validation
-        current_price = data['Close'].iloc[-1]
-        recent_prices = data['Close'].tail(50) if len(data) >= 50 else data['Close']
-        std_dev = recent_prices.std()
-        manual_devstep = (current_price - sma_50) / std_dev if std_dev > 0 else 0.0
-        print(f"  - Current price: ${current_price:.2f}")
-        print(f"  - 50-day SMA: ${sma_50:.2f}")
-        print(f"  - Standard deviation (last 50): ${std_dev:.2f}")
-        print(f"  - Manual devstep: {manual_devstep:.4f}")
-        print(f"  - Validation: {'✓ PASS' if abs(devstep - manual_devstep) < 0.0001 else '✗ FAIL'}")
-        
-        # Calculate signal
-        print(f"\nStep 5: Calculating signal...")
-        signal = calculate_signal(devstep)
-        print(f"✓ Signal: {signal}")
-        print(f"  - Based on devstep: {devstep:.4f}")
-        
-        # Get full metrics
-        print(f"\nStep 6: Getting full metrics...")
-        metrics = get_stock_metrics(ticker)
-        print(f"✓ Full metrics retrieved")
-        print(f"\n{'='*80}")
-        print("FINAL METRICS SUMMARY:")
-        print(f"{'='*80}")
-        print(f"Ticker: {metrics['ticker']}")
-        print(f"Current Price: ${metrics['current_price']:.2f}")
-        print(f"50-day SMA: ${metrics['sma_50']:.2f}")
-        print(f"200-day SMA: ${metrics['sma_200']:.2f}")
-        print(f"Devstep: {metrics['devstep']:.4f}")
-        print(f"Signal: {metrics['signal']}")
-        print(f"Data Points: {metrics['data_points']}")
-        print(f"Cached: {metrics['cached']}")
-        if metrics.get('cache_timestamp'):
-            print(f"Cache Timestamp: {metrics['cache_timestamp']}")
-        print(f"{'='*80}\n")
-        
-        # Assertions
-        assert metrics['ticker'] == ticker.upper()
-        assert metrics['sma_50'] > 0
-        assert metrics['sma_200'] > 0
-        assert metrics['current_price'] > 0
-        assert metrics['data_points'] > 0
-        assert abs(metrics['sma_50'] - sma_50) < 0.01
-        assert abs(metrics['sma_200'] - sma_200) < 0.01
-        
-        # Print captured output
-        captured = capsys.readouterr()
-        print(captured.out)
-
+    @pytest.mark.parametrize("window", [50, 200])
+    def test_tsla_sma_matches_manual(self, tsla_data, window):
+        """Test that calculate_sma matches the mean of the last `window` closes."""
+        assert calculate_sma(tsla_data, window) == pytest.approx(tsla_data['Close'].tail(window).mean(), abs=0.01)
+    
+    def test_tsla_metrics_match_manual(self, tsla_data):
+        """Test that get_stock_metrics agrees with the individually calculated values."""
+        recent_prices = tsla_data['Close'].tail(50)
+        sma_50 = recent_prices.mean()
+        sma_200 = tsla_data['Close'].tail(200).mean()
+        current_price = tsla_data['Close'].iloc[-1]
+        
+        devstep = calculate_devstep(tsla_data, sma_50)
+        assert devstep == pytest.approx((current_price - sma_50) / recent_prices.std(), abs=1e-4)
+        
+        with patch('app.services.stock_service.fetch_stock_data', return_value=tsla_data):
+            metrics = get_stock_metrics("TSLA")
+        
+        assert metrics['ticker'] == "TSLA"
+        assert metrics['current_price'] == pytest.approx(current_price, abs=0.01)
+        assert metrics['sma_50'] == pytest.approx(sma_50, abs=0.01)
+        assert metrics['sma_200'] == pytest.approx(sma_200, abs=0.01)
+        assert metrics['devstep'] == pytest.approx(devstep, abs=0.01)
+        assert metrics['signal'] == calculate_signal(devstep)
+        assert metrics['data_points'] == len(tsla_data)
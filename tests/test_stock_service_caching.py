@@ -1,45 +1,33 @@
 """Tests for stock service caching functionality."""
+import pickle
 import pytest
 from app.services.stock_service import get_stock_metrics
 from app.services.cache_service import get_cached_data, set_cached_data
-from app.database import engine, create_db_and_tables
+from app.database import engine
+from app.models.stock_cache import StockCache
 from sqlmodel import Session
 from unittest.mock import patch, MagicMock
-import pandas as pd
 from datetime import datetime, timedelta
 
 
-@pytest.fixture(autouse=True)
-def setup_database():
-    """Create database tables before each test."""
-    create_db_and_tables()
-    yield
-    # Cleanup: delete all cache entries after each test
-    with Session(engine) as session:
-        from sqlmodel import select
-        from app.models.stock_cache import StockCache
-        statement = select(StockCache)
-        all_entries = session.exec(statement).all()
-        for entry in all_entries:
-            session.delete(entry)
-        session.commit()
+pytestmark = pytest.mark.usefixtures("clear_stock_cache")
+
+
+@pytest.fixture(scope="module")
+def warm_cache_metrics(synthetic_ohlc):
+    """Call get_stock_metrics once against a warm AAPL cache; returns (metrics, fetch mock)."""
+    set_cached_data("AAPL", synthetic_ohlc)
+    with patch('app.services.stock_service.fetch_stock_data') as mock_fetch:
+        metrics = get_stock_metrics("AAPL")
+    return metrics, mock_fetch
 
 
 class TestStockServiceCaching:
     """Tests for caching in stock service."""
     
-    @patch('app.services.stock_service.fetch_stock_data')
-    def test_get_stock_metrics_uses_cache_when_available(self, mock_fetch):
+    def test_get_stock_metrics_uses_cache_when_available(self, warm_cache_metrics):
         """Test that get_stock_metrics uses cache when available."""
-        # Create cached data
-        dates = pd.date_range(start='2024-01-01', periods=100, freq='D')
-        cached_data = pd.DataFrame({
-            'Close': [100.0 + i * 0.1 for i in range(100)]
-        }, index=dates)
-        set_cached_data("AAPL", cached_data)
-        
-        # Call get_stock_metrics
-        metrics = get_stock_metrics("AAPL")
+        metrics, mock_fetch = warm_cache_metrics
         
         # Verify yfinance was NOT called
         mock_fetch.assert_not_called()
@@ -51,14 +39,10 @@ class TestStockServiceCaching:
         assert "cache_timestamp" in metrics
     
     @patch('app.services.stock_service.fetch_stock_data')
-    def test_get_stock_metrics_fetches_when_cache_missing(self, mock_fetch):
+    def test_get_stock_metrics_fetches_when_cache_missing(self, mock_fetch, synthetic_ohlc):
         """Test that get_stock_metrics fetches from yfinance when cache is missing."""
         # Mock yfinance response
-        dates = pd.date_range(start='2024-01-01', periods=100, freq='D')
-        mock_data = pd.DataFrame({
-            'Close': [100.0 + i * 0.1 for i in range(100)]
-        }, index=dates)
-        mock_fetch.return_value = mock_data
+        mock_fetch.return_value = synthetic_ohlc
         
         # Call get_stock_metrics
         metrics = get_stock_metrics("AAPL")
@@ -77,35 +61,25 @@ class TestStockServiceCaching:
         assert cached_result is not None
     
     @patch('app.services.stock_service.fetch_stock_data')
-    def test_get_stock_metrics_fetches_when_cache_expired(self, mock_fetch):
+    def test_get_stock_metrics_fetches_when_cache_expired(self, mock_fetch, synthetic_ohlc):
         """Test that get_stock_metrics fetches when cache is expired."""
         # Create expired cache entry
-        dates = pd.date_range(start='2024-01-01', periods=100, freq='D')
-        expired_data = pd.DataFrame({
-            'Close': [100.0] * 100
-        }, index=dates)
+        expired_data = synthetic_ohlc.assign(Close=100.0)
         
         # Manually create expired entry
         with Session(engine) as session:
-            from app.models.stock_cache import StockCache
-            import json
-            data_dict = expired_data.to_dict(orient='index')
-            data_dict = {str(k): v for k, v in data_dict.items()}
-            data_json = json.dumps(data_dict)
+            data_bytes = pickle.dumps(expired_data)
             
             expired_entry = StockCache(
                 ticker="AAPL",
-                data=data_json,
+                data=data_bytes,
                 cache_timestamp=datetime.now() - timedelta(hours=25)  # Expired
             )
             session.add(expired_entry)
             session.commit()
         
         # Mock yfinance response
-        mock_data = pd.DataFrame({
-            'Close': [200.0 + i * 0.1 for i in range(100)]
-        }, index=dates)
-        mock_fetch.return_value = mock_data
+        mock_fetch.return_value = synthetic_ohlc
         
         # Call get_stock_metrics
         metrics = get_stock_metrics("AAPL")
@@ -116,23 +90,14 @@ class TestStockServiceCaching:
         # Verify metrics indicate not cached
         assert metrics["cached"] is False
     
-    def test_get_stock_metrics_cache_timestamp_format(self):
+    def test_get_stock_metrics_cache_timestamp_format(self, warm_cache_metrics):
         """Test that cache_timestamp is in ISO format when cached."""
-        # Create cached data
-        dates = pd.date_range(start='2024-01-01', periods=100, freq='D')
-        cached_data = pd.DataFrame({
-            'Close': [100.0 + i * 0.1 for i in range(100)]
-        }, index=dates)
-        set_cached_data("AAPL", cached_data)
-        
-        # Call get_stock_metrics
-        metrics = get_stock_metrics("AAPL")
+        metrics, _ = warm_cache_metrics
         
         # Verify cache_timestamp is present and in ISO format
         assert "cache_timestamp" in metrics
         assert isinstance(metrics["cache_timestamp"], str)
         # Verify it's a valid ISO format by parsing it
-        from datetime import datetime
         parsed = datetime.fromisoformat(metrics["cache_timestamp"])
         assert isinstance(parsed, datetime)
 